@@ -6,10 +6,11 @@ import io
 # import os # Only needed by __main__ if checking files, not needed if DB only
 import json # Potentially needed by /cut for log_entry formatting before DB
 import datetime
-from typing import List, Dict, Tuple, Optional 
+from typing import List, Dict, Tuple, Optional, Union
 import asyncpg # For database interactions
 import asyncio  # <-- Make sure this is here
 import logging  # <-- Add this for better logs
+import traceback
 
 import config # Your configuration file
 import utils  # Your utility functions
@@ -44,7 +45,7 @@ class RaidManagerBot(commands.Bot):
         # Initialize as instance attributes
         self.db_pool: Optional[asyncpg.Pool] = None # For database connection pool
         self.alt_mappings: Dict[str, AltInfo] = {}
-        self.run_logs: List[Dict] = []
+        self.run_logs: List[Union[Dict, asyncpg.Record]] = [] # DB rows stay Records; entries added by /cut are dicts
 
     async def setup_hook(self):
         # --- DATABASE CONNECTION AND INITIAL DATA LOAD (WITH RETRY LOGIC) ---
@@ -61,9 +62,11 @@ class RaidManagerBot(commands.Bot):
                 # Create the connection pool. A timeout is added to each connection attempt.
                 self.db_pool = await asyncpg.create_pool(
                     dsn=config.DATABASE_URL, 
-                    min_size=1, 
-                    max_size=10,
-                    timeout=15 # Timeout for an individual connection attempt
+                    min_size=getattr(config, 'DB_POOL_MIN_SIZE', 1), 
+                    max_size=getattr(config, 'DB_POOL_MAX_SIZE', 10),
+                    statement_cache_size=getattr(config, 'DB_STATEMENT_CACHE_SIZE', 1024), # Keeps hot queries prepared
+                    timeout=15, # Timeout for an individual connection attempt
+                    init=utils.init_db_connection # Registers the JSONB codec on each new connection
                 )
                 
                 if self.db_pool:
@@ -84,7 +87,6 @@ class RaidManagerBot(commands.Bot):
                     await asyncio.sleep(retry_delay)
                 else:
                     logging.critical("❌ Could not establish database connection after all retries.")
-                    import traceback
                     traceback.print_exc()
                     self.db_pool = None # Ensure pool is None on final failure
         
@@ -101,7 +103,6 @@ class RaidManagerBot(commands.Bot):
                 logging.info(f"Successfully loaded extension: {extension}")
             except Exception as e_load_ext:
                 logging.error(f"Failed to load extension {extension}: {e_load_ext}")
-                import traceback
                 traceback.print_exc()
 
         # --- COMMAND SYNCING (Your existing code is good) ---
@@ -207,7 +208,6 @@ async def set_payment_char_command(interaction: discord.Interaction, payment_alt
         print(f"User {interaction.user.name} ({user_id}) set payment char to {cleaned_alt_name} ({chosen_faction}). Saved to DB.")
     except Exception as e:
         print(f"ERROR in set_payment_char_command while saving to DB: {e}")
-        import traceback
         traceback.print_exc()
         await interaction.followup.send("An error occurred while trying to save your payment character. Please try again.", ephemeral=True)
 
@@ -229,6 +229,32 @@ async def check_payment_alt_command(interaction: discord.Interaction):
             ephemeral=True
         )
 
+LOG_CSV_FIELDNAMES = [
+    "run_date", "wcl_link", "total_gold_run", "guild_share_run",
+    "raid_leader_share_run", "gold_per_booster_run", "booster_name",
+    "booster_discord_id", "is_benched_player_on_this_row", "run_processed_by",
+    "run_timestamp_utc"
+]
+
+def _csv_escape(value) -> str:
+    """Formats one CSV field the way csv.writer does with the default (QUOTE_MINIMAL) dialect."""
+    text = "" if value is None else str(value)
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def _booster_name_and_id(booster) -> Tuple[str, str]:
+    """Reads one active_boosters entry in either stored shape.
+
+    Logs added by /cut this session hold {"name", "discord_id"} dicts; logs loaded from the DB
+    hold the [name, discord_id] pairs /cut saved, decoded from JSONB as lists.
+    """
+    if isinstance(booster, dict):
+        return booster.get("name", ""), booster.get("discord_id", "")
+    if isinstance(booster, (list, tuple)) and len(booster) >= 2:
+        return booster[0], booster[1]
+    return "", ""
+
 @bot.tree.command(name="log", description="Export all run logs to a CSV file. (Admin Only)")
 @app_commands.checks.has_any_role(*config.ALLOWED_ROLES_FOR_ADMIN_CMDS)
 async def log_command(interaction: discord.Interaction):
@@ -238,16 +264,9 @@ async def log_command(interaction: discord.Interaction):
         await interaction.followup.send("No logs available to export.", ephemeral=True)
         return
 
-    output = io.StringIO()
-    fieldnames = [
-        "run_date", "wcl_link", "total_gold_run", "guild_share_run",
-        "raid_leader_share_run", "gold_per_booster_run", "booster_name",
-        "booster_discord_id", "is_benched_player_on_this_row", "run_processed_by",
-        "run_timestamp_utc"
-    ]
-    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore', restval="")
-    writer.writeheader()
-
+    # Rows are formatted straight to strings and written once; matches csv.DictWriter's output
+    rows = [",".join(LOG_CSV_FIELDNAMES)]
+    blank_row = "," * (len(LOG_CSV_FIELDNAMES) - 1)
     for idx, log_entry in enumerate(bot_instance.run_logs):
         active_list = log_entry.get("active_boosters", [])
         benched_list = log_entry.get("benched_players", [])
@@ -266,17 +285,17 @@ async def log_command(interaction: discord.Interaction):
                 row_data["run_timestamp_utc"] = log_entry.get("timestamp_utc", "")
 
             if i < len(active_list):
-                booster = active_list[i]
-                row_data["booster_name"] = booster.get("name", "")
-                row_data["booster_discord_id"] = booster.get("discord_id", "")
+                row_data["booster_name"], row_data["booster_discord_id"] = _booster_name_and_id(active_list[i])
             if i < len(benched_list):
                 row_data["is_benched_player_on_this_row"] = benched_list[i]
             if row_data:
-                writer.writerow(row_data)
+                rows.append(",".join(_csv_escape(row_data.get(k, "")) for k in LOG_CSV_FIELDNAMES))
         
         if max_r > 0 and len(bot_instance.run_logs) > 1 and idx < len(bot_instance.run_logs) -1 :
-            writer.writerow({key: "" for key in fieldnames})
+            rows.append(blank_row)
 
+    output = io.StringIO()
+    output.write("\r\n".join(rows) + "\r\n")
     output.seek(0)
     await interaction.followup.send("Run logs exported:", file=discord.File(fp=output, filename="all_run_logs.csv"), ephemeral=True)
 
@@ -291,6 +310,140 @@ async def log_error(interaction: discord.Interaction, error: app_commands.AppCom
         print(f"Error in /log command: {error}")
         await send_method("An error occurred while generating the log.", ephemeral=True)
 
+# --- PUBLIC_SUMMARY_CHANNEL_IDS parsing ---
+# Each parser returns (channel_ids_to_process, source_of_channels).
+_CONFIG_CHANNEL_SOURCE = "config (PUBLIC_SUMMARY_CHANNEL_IDS)"
+
+def _parse_channel_id_list(value, interaction: discord.Interaction, guild_id: Optional[int]) -> Tuple[List[int], str]:
+    if not value:
+        print("INFO: PUBLIC_SUMMARY_CHANNEL_IDS is configured as an empty list. No public messages will be sent via config for this run.")
+    channel_ids: List[int] = []
+    for item in value:
+        try:
+            channel_ids.append(int(item))
+        except (ValueError, TypeError):
+            print(f"WARNING: Invalid channel ID '{item}' in PUBLIC_SUMMARY_CHANNEL_IDS list. Skipping.")
+    return channel_ids, _CONFIG_CHANNEL_SOURCE
+
+def _parse_channel_id_scalar(value, interaction: discord.Interaction, guild_id: Optional[int]) -> Tuple[List[int], str]:
+    try:
+        return [int(value)], _CONFIG_CHANNEL_SOURCE
+    except (ValueError, TypeError):
+        print(f"WARNING: Invalid PUBLIC_SUMMARY_CHANNEL_IDS value '{value}'. Skipping.")
+        return [], _CONFIG_CHANNEL_SOURCE
+
+def _parse_channel_id_none(value, interaction: discord.Interaction, guild_id: Optional[int]) -> Tuple[List[int], str]:
+    # Fallback to interaction channel
+    source_of_channels = "interaction.channel_id (fallback)"
+    if interaction.channel_id:
+        print(f"DEBUG: PUBLIC_SUMMARY_CHANNEL_IDS not in config. Using interaction channel ({interaction.channel_id}) for server {guild_id}.")
+        return [interaction.channel_id], source_of_channels
+    if guild_id: # Has guild context, but no specific channel_id from interaction (should be rare for slash commands)
+        print(f"ERROR: PUBLIC_SUMMARY_CHANNEL_IDS not in config, and interaction.channel_id is None, but guild context ({guild_id}) exists. Cannot determine fallback channel.")
+    else: # No guild context and no channel_id from interaction (e.g. DM context, though less likely for this command)
+        print("ERROR: PUBLIC_SUMMARY_CHANNEL_IDS not in config and no interaction channel/guild context. Cannot determine public channel.")
+    return [], source_of_channels
+
+def _parse_channel_id_unknown(value, interaction: discord.Interaction, guild_id: Optional[int]) -> Tuple[List[int], str]:
+    print(f"WARNING: PUBLIC_SUMMARY_CHANNEL_IDS is an unexpected type ({type(value)}). No public messages sent via config.")
+    return [], _CONFIG_CHANNEL_SOURCE
+
+_CHANNEL_ID_PARSERS = {
+    list: _parse_channel_id_list,
+    tuple: _parse_channel_id_list,
+    str: _parse_channel_id_scalar,
+    int: _parse_channel_id_scalar,
+    type(None): _parse_channel_id_none,
+}
+
+def _parse_channel_ids(value, interaction: discord.Interaction, guild_id: Optional[int]) -> Tuple[List[int], str]:
+    """Normalizes PUBLIC_SUMMARY_CHANNEL_IDS into a list of channel IDs, dispatching on its type."""
+    return _CHANNEL_ID_PARSERS.get(type(value), _parse_channel_id_unknown)(value, interaction, guild_id)
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+_bg_tasks: "set[asyncio.Task]" = set()
+
+def _on_bg_task_done(task: asyncio.Task) -> None:
+    """Done callback for background tasks: releases the reference and logs any escaped exception."""
+    _bg_tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception() # Retrieving it also silences asyncio's "never retrieved" warning
+    if error is not None:
+        logging.exception(f"Background task {task.get_name()} failed", exc_info=error)
+
+async def _dispatch_public_messages(target_public_channels: List[discord.TextChannel],
+                                    public_embed: discord.Embed,
+                                    public_warning_ping_list: List[str],
+                                    interaction: discord.Interaction,
+                                    configured_channel_ids_setting):
+    """Sends the public summary and alt warnings to each resolved channel.
+
+    Runs as a background task so /cut doesn't wait on the broadcast. Failures on
+    *configured* channels are collected and reported to the admin once at the end.
+    """
+    sent_to_at_least_one_channel = False
+    admin_failure_notices: List[str] = []
+    print(f"INFO: Attempting to send public messages to {len(target_public_channels)} channel(s).")
+
+    for P_channel_obj in target_public_channels: # Renamed to avoid conflict if any
+        channel_name_for_log = f"{P_channel_obj.name} ({P_channel_obj.id})"
+        # 1. Send Public Raid Cut Summary
+        try:
+            await P_channel_obj.send(embed=public_embed)
+            print(f"INFO: Public summary sent successfully to channel {channel_name_for_log}.")
+            sent_to_at_least_one_channel = True
+        except discord.Forbidden:
+            print(f"ERROR: Bot lacks permission for Public Summary in {channel_name_for_log}.")
+            if configured_channel_ids_setting is not None: # Inform admin if this was a *configured* channel
+                admin_failure_notices.append(f"Warning: Failed to send public raid summary to {P_channel_obj.mention} due to permissions.")
+        except Exception as e_ps:
+            print(f"ERROR: Unexpected error sending Public Summary to {channel_name_for_log}: {e_ps}")
+            if configured_channel_ids_setting is not None:
+                admin_failure_notices.append(f"Warning: An unexpected error occurred sending public raid summary to {P_channel_obj.mention}: {e_ps}")
+
+        # 2. Send Public Payment Warnings (if any)
+        if public_warning_ping_list:
+            public_warnings_title = "**⚠️ Public Alt/Faction Warnings**"
+            public_warnings_content_str = "\n".join(public_warning_ping_list) 
+            full_public_warning_message = f"{public_warnings_title}\n{public_warnings_content_str}"
+
+            if len(full_public_warning_message) > 1950: # Discord message limit is 2000
+                warning_output_file = io.StringIO()
+                warning_output_file.write(full_public_warning_message.replace("\\n", "\n")) # Correct newlines for file
+                warning_output_file.seek(0)
+                try:
+                    await P_channel_obj.send(
+                        f"{public_warnings_title}\n(List too long, warnings with pings attached as `payment_warnings.txt`)",
+                        file=discord.File(fp=warning_output_file, filename="payment_warnings.txt"),
+                        allowed_mentions=discord.AllowedMentions(users=True) 
+                    )
+                    print(f"INFO: Public payment warnings (with pings) sent as a file to {channel_name_for_log}.")
+                    sent_to_at_least_one_channel = True 
+                except discord.Forbidden: print(f"ERROR: Bot lacks permission for Public Warnings (file) in {channel_name_for_log}.")
+                except Exception as e_pwf: print(f"ERROR: Unexpected error sending Public Warnings (file) to {channel_name_for_log}: {e_pwf}")
+                finally: warning_output_file.close()
+            else:
+                try:
+                    await P_channel_obj.send(
+                        full_public_warning_message,
+                        allowed_mentions=discord.AllowedMentions(users=True)
+                    )
+                    print(f"INFO: Public payment warnings (with pings) sent as a message to {channel_name_for_log}.")
+                    sent_to_at_least_one_channel = True
+                except discord.Forbidden: print(f"ERROR: Bot lacks permission for Public Warnings (message) in {channel_name_for_log}.")
+                except Exception as e_pwm: print(f"ERROR: Unexpected error sending Public Warnings (message) to {channel_name_for_log}: {e_pwm}")
+
+    if not sent_to_at_least_one_channel:
+         print(f"INFO: Although {len(target_public_channels)} channel(s) were resolved, no public messages (summary or warnings) were successfully sent due to errors/permissions.")
+
+    if admin_failure_notices:
+        try:
+            await interaction.followup.send("\n".join(admin_failure_notices), ephemeral=True)
+        except Exception as e_followup: # Webhook token may have expired by now
+            print(f"Error sending followup for public message failures: {e_followup}")
+            for notice in admin_failure_notices: print(f"INFO: {notice}")
+
 # --- /cut command ---
 @bot.tree.command(name="cut", description="Calc gold, log, & generate payment strings. (Admin Only)") # Removed "optionally"
 @app_commands.checks.has_any_role(*config.ALLOWED_ROLES_FOR_ADMIN_CMDS)
@@ -325,6 +478,9 @@ async def cut_command(
     if not roster_file.filename.lower().endswith(('.txt', '.csv')):
         await interaction.followup.send("Roster file must be a `.txt` or `.csv` file.", ephemeral=True)
         return
+    if roster_file.size > getattr(config, 'MAX_ROSTER_FILE_BYTES', 256 * 1024):
+        await interaction.followup.send("Roster file too large.", ephemeral=True)
+        return
 
     try:
         roster_bytes = await roster_file.read()
@@ -402,7 +558,8 @@ async def cut_command(
     }
     
     try:
-        await utils.save_run_log_entry_to_db(bot_instance.db_pool, log_entry_data)
+        # run_date arrives as a 'YYYY-MM-DD' string from the roster; type it once for the DB
+        await utils.save_run_log_entry_to_db(bot_instance.db_pool, utils.coerce_log_entry_dates(log_entry_data))
         
         # Update in-memory cache (self.bot.run_logs)
         # Create a copy to modify for the cache if its structure needs to differ (e.g., for older CSV export logic)
@@ -417,29 +574,28 @@ async def cut_command(
         print(f"Saved run log to DB. Total in-memory logs: {len(bot_instance.run_logs)}")
     except Exception as e:
         print(f"ERROR in cut_command while saving run log to DB: {e}")
-        import traceback
         traceback.print_exc()
         await interaction.followup.send("An error occurred while saving the run log. The cut was processed, but logging failed.", ephemeral=True)
         # Consider if processing should halt if logging fails
         # return 
 
     # --- Create Public Embed ---
+    wcl_report_name = warcraft_logs_link.rsplit('/', 1)[-1] if '/' in warcraft_logs_link else 'Report'
+    wcl_field_value = f"[{wcl_report_name}]({warcraft_logs_link})" # Shared by public and admin embeds
     public_embed = discord.Embed(title=f"Raid Cut Summary: {run_date_from_csv}", color=discord.Color.green())
-    public_embed.add_field(name="Logs", value=f"[{warcraft_logs_link.split('/')[-1] if '/' in warcraft_logs_link else 'Report'}]({warcraft_logs_link})", inline=False)
+    public_embed.add_field(name="Logs", value=wcl_field_value, inline=False)
     public_embed.add_field(name="Booster Cut", value=f"{gold_per_booster_precise:,.2f}g", inline=True)
     public_embed.add_field(name="Num. of Boosters", value=str(len(active_boosters_with_ids)), inline=True)
     public_booster_names = [n for n, d in active_boosters_with_ids]
-    public_booster_list_str = "\n".join(public_booster_names)
-    if len(public_booster_list_str) > 1020: public_booster_list_str = public_booster_list_str[:1020] + "..."
+    public_booster_list_str = utils.truncate_join(public_booster_names)
     public_embed.add_field(name=f"Active Boosters ({len(public_booster_names)})", value=public_booster_list_str or "None", inline=False)
-    public_benched_list_str = "\n".join(benched_players_names)
-    if len(public_benched_list_str) > 1020: public_benched_list_str = public_benched_list_str[:1020] + "..."
+    public_benched_list_str = utils.truncate_join(benched_players_names)
     public_embed.add_field(name=f"Benched ({len(benched_players_names)})", value=public_benched_list_str or "None", inline=False)
     public_embed.set_footer(text="Run processed. Admins have detailed view & payment options.")
 
     # --- Admin Embed ---
     admin_embed = discord.Embed(title=f"ADMIN VIEW - Cut Details: {run_date_from_csv}", color=discord.Color.gold())
-    admin_embed.add_field(name="Logs", value=f"[{warcraft_logs_link.split('/')[-1] if '/' in warcraft_logs_link else 'Report'}]({warcraft_logs_link})", inline=False)
+    admin_embed.add_field(name="Logs", value=wcl_field_value, inline=False)
     admin_embed.add_field(name="Total Gold Pot", value=f"{total_gold:,d}g", inline=True)
     if actual_rl_cut_percentage > 0:
         admin_embed.add_field(name=f"Raid Leader Cut ({actual_rl_cut_percentage*100:.1f}%)", value=f"{calculated_raid_leader_share_amount:,.2f}g (Manual Payout)", inline=True)
@@ -450,8 +606,7 @@ async def cut_command(
     admin_embed.add_field(name="Gold/Booster (Precise)", value=f"{gold_per_booster_precise:,.2f}g", inline=True)
     admin_embed.add_field(name="Gold/Booster (Mail)", value=f"{gold_per_booster_for_payment:,d}g", inline=True)
     admin_booster_details = [f"{name} (ID: `{disc_id}`)" for name, disc_id in active_boosters_with_ids]
-    admin_booster_list_str = "\n".join(admin_booster_details)
-    if len(admin_booster_list_str) > 1020: admin_booster_list_str = admin_booster_list_str[:1020] + "..."
+    admin_booster_list_str = utils.truncate_join(admin_booster_details)
     admin_embed.add_field(name=f"Active Boosters + IDs ({len(admin_booster_details)})", value=admin_booster_list_str or "None", inline=False)
     admin_embed.add_field(name=f"Benched ({len(benched_players_names)})", value=public_benched_list_str or "None", inline=False)
     admin_embed.set_footer(text=f"Processed by: {interaction.user.display_name}")
@@ -533,54 +688,24 @@ async def cut_command(
     target_public_channels: List[discord.TextChannel] = []
     configured_channel_ids_setting = getattr(config, 'PUBLIC_SUMMARY_CHANNEL_IDS', None)
 
-    channel_ids_to_process: List[int] = []
-    source_of_channels = "config (PUBLIC_SUMMARY_CHANNEL_IDS)"
     current_guild_id = interaction.guild_id # Get the guild ID where the command was run
-
-    if isinstance(configured_channel_ids_setting, list):
-        if not configured_channel_ids_setting:
-            print("INFO: PUBLIC_SUMMARY_CHANNEL_IDS is configured as an empty list. No public messages will be sent via config for this run.")
-        for item in configured_channel_ids_setting:
-            try:
-                channel_ids_to_process.append(int(item))
-            except (ValueError, TypeError):
-                print(f"WARNING: Invalid channel ID '{item}' in PUBLIC_SUMMARY_CHANNEL_IDS list. Skipping.")
-    elif isinstance(configured_channel_ids_setting, (str, int)):
-        try:
-            channel_ids_to_process.append(int(configured_channel_ids_setting))
-        except (ValueError, TypeError):
-            print(f"WARNING: Invalid PUBLIC_SUMMARY_CHANNEL_IDS value '{configured_channel_ids_setting}'. Skipping.")
-    elif configured_channel_ids_setting is None: # Fallback to interaction channel
-        source_of_channels = "interaction.channel_id (fallback)"
-        if interaction.channel_id:
-            channel_ids_to_process.append(interaction.channel_id)
-            print(f"DEBUG: PUBLIC_SUMMARY_CHANNEL_IDS not in config. Using interaction channel ({interaction.channel_id}) for server {current_guild_id}.")
-        elif current_guild_id: # Has guild context, but no specific channel_id from interaction (should be rare for slash commands)
-            print(f"ERROR: PUBLIC_SUMMARY_CHANNEL_IDS not in config, and interaction.channel_id is None, but guild context ({current_guild_id}) exists. Cannot determine fallback channel.")
-        else: # No guild context and no channel_id from interaction (e.g. DM context, though less likely for this command)
-            print("ERROR: PUBLIC_SUMMARY_CHANNEL_IDS not in config and no interaction channel/guild context. Cannot determine public channel.")
-    else:
-        print(f"WARNING: PUBLIC_SUMMARY_CHANNEL_IDS is an unexpected type ({type(configured_channel_ids_setting)}). No public messages sent via config.")
+    channel_ids_to_process, source_of_channels = _parse_channel_ids(configured_channel_ids_setting, interaction, current_guild_id)
 
     if not current_guild_id and channel_ids_to_process and configured_channel_ids_setting is not None:
         print(f"WARNING: Command used outside of a server (guild_id is None), but PUBLIC_SUMMARY_CHANNEL_IDS is configured. Cannot filter by server, so no public messages will be sent from config to avoid cross-server leakage.")
         channel_ids_to_process = [] # Clear it to prevent sending to all configured channels if not in a guild
 
     for channel_id_val in channel_ids_to_process:
-        _channel = bot_instance.get_channel(channel_id_val)
-        if _channel and isinstance(_channel, discord.TextChannel):
-            if _channel.guild and _channel.guild.id == current_guild_id:
-                target_public_channels.append(_channel)
-                print(f"DEBUG: Resolved public channel for current server ({current_guild_id}): '{_channel.name}' ({_channel.id}) from ID {channel_id_val} (source: {source_of_channels}).")
-            elif not _channel.guild:
-                 print(f"DEBUG: Configured channel '{_channel.name}' ({_channel.id}) is a DM or group channel, not in a server. Skipping for guild-specific announcements.")
-            elif current_guild_id: # Channel is in a guild, but a different one
-                print(f"DEBUG: Configured channel '{_channel.name}' ({_channel.id}) in server {_channel.guild.id} does not match current server {current_guild_id}. Skipping.")
-            # If current_guild_id was None but we somehow still processed a channel_id (e.g. from fallback interaction.channel_id which was a DM), this logic is okay.
-        elif _channel:
-            print(f"ERROR: Configured channel ID {channel_id_val} (source: {source_of_channels}) is not a TextChannel (type: {type(_channel)}). Skipping.")
-        else:
+        _channel = bot_instance.get_channel(channel_id_val) # Resolved once: a dict lookup in discord.py's cache
+        if _channel is None:
             print(f"ERROR: Configured channel ID {channel_id_val} (source: {source_of_channels}) not found or bot lacks access. Skipping.")
+        elif not isinstance(_channel, discord.TextChannel):
+            print(f"ERROR: Configured channel ID {channel_id_val} (source: {source_of_channels}) is not a TextChannel (type: {type(_channel)}). Skipping.")
+        elif _channel.guild.id == current_guild_id:
+            target_public_channels.append(_channel)
+            print(f"DEBUG: Resolved public channel for current server ({current_guild_id}): '{_channel.name}' ({_channel.id}) from ID {channel_id_val} (source: {source_of_channels}).")
+        elif current_guild_id: # Channel is in a guild, but a different one
+            print(f"DEBUG: Configured channel '{_channel.name}' ({_channel.id}) in server {_channel.guild.id} does not match current server {current_guild_id}. Skipping.")
 
     if not target_public_channels:
         # This message covers cases where config was provided but no channels matched the current server, or config was empty/invalid.
@@ -602,74 +727,16 @@ async def cut_command(
         else:
              print("INFO: No target channels resolved for public messages after processing config and fallbacks for the current server.")
             
-    # --- Send Public Messages to Resolved Channels ---
+    # --- Send Public Messages to Resolved Channels (in background) ---
     if not target_public_channels:
         print("INFO: No public channels to send messages to.")
     else:
-        sent_to_at_least_one_channel = False
-        print(f"INFO: Attempting to send public messages to {len(target_public_channels)} channel(s).")
-
-        for P_channel_obj in target_public_channels: # Renamed to avoid conflict if any
-            channel_name_for_log = f"{P_channel_obj.name} ({P_channel_obj.id})"
-            # 1. Send Public Raid Cut Summary
-            try:
-                await P_channel_obj.send(embed=public_embed)
-                print(f"INFO: Public summary sent successfully to channel {channel_name_for_log}.")
-                sent_to_at_least_one_channel = True
-            except discord.Forbidden:
-                print(f"ERROR: Bot lacks permission for Public Summary in {channel_name_for_log}.")
-                if configured_channel_ids_setting is not None: # Inform admin if this was a *configured* channel
-                    try: await interaction.followup.send(f"Warning: Failed to send public raid summary to {P_channel_obj.mention} due to permissions.", ephemeral=True)
-                    except: pass 
-            except Exception as e_ps:
-                print(f"ERROR: Unexpected error sending Public Summary to {channel_name_for_log}: {e_ps}")
-                if configured_channel_ids_setting is not None:
-                    try: await interaction.followup.send(f"Warning: An unexpected error occurred sending public raid summary to {P_channel_obj.mention}: {e_ps}", ephemeral=True)
-                    except: pass
-            
-            # 2. Send Public Payment Warnings (if any)
-            if public_warning_ping_list:
-                public_warnings_title = "**⚠️ Public Alt/Faction Warnings**"
-                public_warnings_content_str = "\n".join(public_warning_ping_list) 
-                full_public_warning_message = f"{public_warnings_title}\n{public_warnings_content_str}"
-
-                if len(full_public_warning_message) > 1950: # Discord message limit is 2000
-                    warning_output_file = io.StringIO()
-                    warning_output_file.write(full_public_warning_message.replace("\\n", "\n")) # Correct newlines for file
-                    warning_output_file.seek(0)
-                    try:
-                        await P_channel_obj.send(
-                            f"{public_warnings_title}\n(List too long, warnings with pings attached as `payment_warnings.txt`)",
-                            file=discord.File(fp=warning_output_file, filename="payment_warnings.txt"),
-                            allowed_mentions=discord.AllowedMentions(users=True) 
-                        )
-                        print(f"INFO: Public payment warnings (with pings) sent as a file to {channel_name_for_log}.")
-                        sent_to_at_least_one_channel = True 
-                    except discord.Forbidden: print(f"ERROR: Bot lacks permission for Public Warnings (file) in {channel_name_for_log}.")
-                    except Exception as e_pwf: print(f"ERROR: Unexpected error sending Public Warnings (file) to {channel_name_for_log}: {e_pwf}")
-                    finally: warning_output_file.close()
-                else:
-                    try:
-                        await P_channel_obj.send(
-                            full_public_warning_message,
-                            allowed_mentions=discord.AllowedMentions(users=True)
-                        )
-                        print(f"INFO: Public payment warnings (with pings) sent as a message to {channel_name_for_log}.")
-                        sent_to_at_least_one_channel = True
-                    except discord.Forbidden: print(f"ERROR: Bot lacks permission for Public Warnings (message) in {channel_name_for_log}.")
-                    except Exception as e_pwm: print(f"ERROR: Unexpected error sending Public Warnings (message) to {channel_name_for_log}: {e_pwm}")
-            elif public_warning_ping_list and not sent_to_at_least_one_channel: # Warnings existed, but no channel was suitable for *any* message yet
-                # This specific log might be redundant if the initial "No public channels to send messages to" or resolution errors covered it.
-                # However, if summary failed but warnings could theoretically go, this might be relevant.
-                # For simplicity, this specific log can be removed if other logs are clear.
-                pass # Covered by general channel failure logs
-
-        if not sent_to_at_least_one_channel and target_public_channels:
-             print(f"INFO: Although {len(target_public_channels)} channel(s) were resolved, no public messages (summary or warnings) were successfully sent due to errors/permissions.")
-        elif not sent_to_at_least_one_channel and not target_public_channels and public_warning_ping_list:
-            # This case means: No channels resolved AND there were warnings to send.
-            # The "No target channels resolved for public messages..." log and potentially an ephemeral already covered the channel part.
-            print("INFO: Public payment warnings were generated but could not be sent publicly as no channels were resolved/accessible.")
+        task = asyncio.create_task(_dispatch_public_messages(
+            target_public_channels, public_embed, public_warning_ping_list,
+            interaction, configured_channel_ids_setting
+        ))
+        _bg_tasks.add(task)
+        task.add_done_callback(_on_bg_task_done)
 
 
 @cut_command.error
@@ -690,9 +757,7 @@ async def cut_error(interaction: discord.Interaction, error: app_commands.AppCom
     if isinstance(error, app_commands.MissingAnyRole):
         await send_method("You do not have the required role to use this command.", ephemeral=True)
     else:
-        print(f"Error in /cut command: {error}")
-        import traceback
-        traceback.print_exc()
+        logging.exception("Error in /cut command: %s", error, exc_info=error)
         await send_method("An unexpected error occurred while processing the cut. Please check the bot logs.", ephemeral=True)
 
 # --- Main Execution Block ---
@@ -734,6 +799,4 @@ if __name__ == "__main__":
         except discord.LoginFailure:
             print("ERROR: Failed to log in. Check if BOT_TOKEN is correct and valid.")
         except Exception as e:
-            print(f"ERROR: An unexpected error occurred while trying to run the bot: {e}")
-            import traceback
-            traceback.print_exc()
\ No newline at end of file
+            logging.exception("ERROR: An unexpected error occurred while trying to run the bot: %s", e)
\ No newline at end of file
@@ -1,14 +1,34 @@
 # utils.py
-import discord
-import io
-# import csv # No longer needed for alts if fully on DB
+import csv # Roster exports with quoted fields
+import io # Already loaded by the interpreter at startup, so importing it eagerly is free
 import os # Still useful for some path operations if any remain, but not for core data
-import json # Still needed for active_boosters/benched_players JSONB
+import orjson # JSONB codec for active_boosters/benched_players
 import datetime
-from typing import List, Dict, Tuple, TypedDict, Optional, Any # Any for db args
+from typing import List, Dict, Tuple, TypedDict, Optional, Any, AsyncIterator, TYPE_CHECKING # Any for db args
 import asyncpg # New import
-import csv
-from io import StringIO
+import re
+import operator
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+if TYPE_CHECKING: # discord is only needed at runtime by send_long_message_or_file, which imports it lazily
+    import discord
+
+# The supported, DB-backed API. The old file-based CSV/JSON helpers are gone (see bot.py for the live bot).
+__all__ = [
+    "AltInfo", "is_valid_date", "init_db_connection",
+    "db_session", "db_execute_conn", "db_fetchrow_conn", "db_fetch_conn",
+    "db_execute", "db_execute_many", "db_fetchrow", "db_fetch",
+    "setup_database_tables",
+    "invalidate_alt_cache", "load_all_alt_mappings_from_db", "get_alt_from_db", "get_alts_bulk",
+    "save_alt_to_db", "save_alts_bulk_to_db", "save_alts_bulk_to_db_conn",
+    "iter_run_logs_from_db", "load_all_run_logs_from_db", "load_run_logs_page_from_db",
+    "coerce_log_entry_dates", "save_run_log_entry_to_db", "save_run_log_entry_to_db_conn",
+    "save_run_log_entries_bulk_to_db",
+    "truncate_join", "parse_roster_data", "send_long_message_or_file",
+]
 
 # import config # Not strictly needed if DATABASE_URL is passed around, but can be for consistency
 
@@ -18,130 +38,348 @@ class AltInfo(TypedDict):
     faction: str
 
 # --- Helper Functions ---
+_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}') # Strict YYYY-MM-DD shape, ASCII digits only
+
+def _parse_ymd(date_string: str) -> datetime.date:
+    """Parses 'YYYY-MM-DD' with the C-level date.fromisoformat. Raises ValueError if invalid."""
+    if not _DATE_RE.fullmatch(date_string): # fromisoformat alone also accepts e.g. '20240101' on 3.11+
+        raise ValueError(f"'{date_string}' is not in YYYY-MM-DD format")
+    return datetime.date.fromisoformat(date_string) # Range-checks month/day
+
 def is_valid_date(date_string: str) -> bool:
+    if not _DATE_RE.fullmatch(date_string): # Common invalid input is rejected without raising
+        return False
     try:
-        datetime.datetime.strptime(date_string, '%Y-%m-%d')
+        datetime.date.fromisoformat(date_string)
         return True
-    except ValueError:
+    except ValueError: # Right shape, impossible date (e.g. 2024-02-30)
         return False
 
 # --- Database Helper Functions ---
+def _encode_jsonb(value: Any) -> bytes:
+    return b'\x01' + orjson.dumps(value) # JSONB binary format: version byte + JSON text (orjson emits UTF-8 bytes)
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(memoryview(data)[1:]) # Skip the version byte without copying the payload
+
+async def init_db_connection(connection: asyncpg.Connection) -> None:
+    """Pool `init=` hook: JSONB columns take and return plain Python lists/dicts.
+
+    The codec uses the binary format so it also applies to COPY (copy_records_to_table).
+    """
+    await connection.set_type_codec('jsonb', encoder=_encode_jsonb, decoder=_decode_jsonb,
+                                    schema='pg_catalog', format='binary')
+
+@asynccontextmanager
+async def db_session(pool: asyncpg.Pool) -> AsyncIterator[asyncpg.Connection]:
+    """Yields one pooled connection for handlers that run several queries in a row.
+
+    Use it with the *_conn helpers below so the whole sequence costs a single acquire/release.
+    """
+    async with pool.acquire() as connection:
+        yield connection
+
+async def db_execute_conn(connection: asyncpg.Connection, query: str, *args: Any) -> None:
+    """Executes a query that doesn't return rows on an already-acquired connection."""
+    await connection.execute(query, *args)
+
+async def db_fetchrow_conn(connection: asyncpg.Connection, query: str, *args: Any) -> Optional[asyncpg.Record]:
+    """Fetches a single row on an already-acquired connection."""
+    return await connection.fetchrow(query, *args)
+
+async def db_fetch_conn(connection: asyncpg.Connection, query: str, *args: Any) -> List[asyncpg.Record]:
+    """Fetches all rows on an already-acquired connection."""
+    return await connection.fetch(query, *args)
+
 async def db_execute(pool: asyncpg.Pool, query: str, *args: Any) -> None:
-    """Executes a query that doesn't return rows (INSERT, UPDATE, DELETE)."""
+    """Executes a query that doesn't return rows (INSERT, UPDATE, DELETE).
+
+    No explicit transaction: a lone statement is already atomic, so BEGIN/COMMIT would only add round-trips.
+    Use db_execute_many when several statements must commit together.
+    """
     async with pool.acquire() as connection:
-        async with connection.transaction(): # Ensure atomic operations
-            await connection.execute(query, *args)
+        await db_execute_conn(connection, query, *args)
+
+async def db_execute_many(pool: asyncpg.Pool, operations: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+    """Runs several (query, args) statements on one connection inside a single transaction."""
+    async with pool.acquire() as connection:
+        async with connection.transaction(): # All or nothing
+            for query, args in operations:
+                await connection.execute(query, *args)
 
 async def db_fetchrow(pool: asyncpg.Pool, query: str, *args: Any) -> Optional[asyncpg.Record]:
     """Fetches a single row."""
     async with pool.acquire() as connection:
-        return await connection.fetchrow(query, *args)
+        return await db_fetchrow_conn(connection, query, *args)
 
 async def db_fetch(pool: asyncpg.Pool, query: str, *args: Any) -> List[asyncpg.Record]:
     """Fetches all rows."""
     async with pool.acquire() as connection:
-        return await connection.fetch(query, *args)
+        return await db_fetch_conn(connection, query, *args)
 
 # --- Core Database Interaction Functions ---
+CREATE_ALTS_SQL = """
+    CREATE TABLE IF NOT EXISTS alts (
+        discord_user_id TEXT PRIMARY KEY,
+        payment_alt_name TEXT NOT NULL,
+        faction TEXT NOT NULL
+    )
+"""
+
+CREATE_RUN_LOGS_SQL = """
+    CREATE TABLE IF NOT EXISTS run_logs (
+        log_id SERIAL PRIMARY KEY,
+        run_date DATE,
+        wcl_link TEXT,
+        total_gold INTEGER,
+        raid_leader_cut_percentage REAL,
+        raid_leader_share_gold REAL,
+        guild_cut_percentage REAL,
+        guild_share_gold REAL,
+        gold_per_booster REAL,
+        num_boosters INTEGER,
+        active_boosters JSONB,
+        benched_players JSONB,
+        processed_by_user_id TEXT,
+        processed_by_username TEXT,
+        timestamp_utc TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'utc')
+    )
+"""
+
+# Lets SELECT_RUN_LOGS_SQL's ORDER BY (and its paged variant) read the index instead of sorting the table
+# log_id breaks timestamp ties so keyset pages are stable
+CREATE_RUN_LOGS_TS_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS run_logs_ts_id_idx ON run_logs (timestamp_utc DESC NULLS LAST, log_id DESC)
+"""
+
 async def setup_database_tables(pool: asyncpg.Pool) -> None:
     """Creates tables if they don't exist."""
     async with pool.acquire() as connection:
-        async with connection.transaction():
-            # Alts Table
-            await connection.execute("""
-                CREATE TABLE IF NOT EXISTS alts (
-                    discord_user_id TEXT PRIMARY KEY,
-                    payment_alt_name TEXT NOT NULL,
-                    faction TEXT NOT NULL
-                );
-            """)
-            print("Table 'alts' checked/created.")
-            # Run Logs Table
-            await connection.execute("""
-                CREATE TABLE IF NOT EXISTS run_logs (
-                    log_id SERIAL PRIMARY KEY,
-                    run_date DATE,
-                    wcl_link TEXT,
-                    total_gold INTEGER,
-                    raid_leader_cut_percentage REAL,
-                    raid_leader_share_gold REAL,
-                    guild_cut_percentage REAL,
-                    guild_share_gold REAL,
-                    gold_per_booster REAL,
-                    num_boosters INTEGER,
-                    active_boosters JSONB,
-                    benched_players JSONB,
-                    processed_by_user_id TEXT,
-                    processed_by_username TEXT,
-                    timestamp_utc TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'utc')
-                );
-            """)
-            print("Table 'run_logs' checked/created.")
+        # Fast path: a catalog lookup instead of taking DDL locks on every startup
+        if await connection.fetchval(
+                "SELECT to_regclass('public.alts') IS NOT NULL AND to_regclass('public.run_logs') IS NOT NULL"
+                " AND to_regclass('public.run_logs_ts_id_idx') IS NOT NULL"):
+            print("Database tables already exist.")
+            return
+        # Argument-less multi-statement execute: one round-trip, run as a single implicit transaction
+        await connection.execute(";".join((CREATE_ALTS_SQL, CREATE_RUN_LOGS_SQL, CREATE_RUN_LOGS_TS_INDEX_SQL)))
+        print("Tables 'alts' and 'run_logs' (and run_logs_ts_id_idx) checked/created.")
         print("Database tables setup complete.")
 
+# Alt queries live at module level so every call sends byte-identical SQL and reuses
+# the connection's cached prepared statement (see DB_STATEMENT_CACHE_SIZE in config).
+SELECT_ALL_ALTS_SQL = "SELECT discord_user_id, payment_alt_name, faction FROM alts"
+
+SELECT_ALT_SQL = "SELECT payment_alt_name, faction FROM alts WHERE discord_user_id = $1"
+
+SELECT_ALTS_BY_IDS_SQL = "SELECT discord_user_id, payment_alt_name, faction FROM alts WHERE discord_user_id = ANY($1::text[])"
+
+UPSERT_ALT_SQL = """
+    INSERT INTO alts (discord_user_id, payment_alt_name, faction)
+    VALUES ($1, $2, $3)
+    ON CONFLICT (discord_user_id) DO UPDATE SET
+        payment_alt_name = EXCLUDED.payment_alt_name,
+        faction = EXCLUDED.faction;
+"""
+
+UPSERT_ALTS_BULK_SQL = """
+    INSERT INTO alts (discord_user_id, payment_alt_name, faction)
+    SELECT discord_user_id, payment_alt_name, faction
+    FROM jsonb_to_recordset($1::jsonb) AS x(discord_user_id TEXT, payment_alt_name TEXT, faction TEXT)
+    ON CONFLICT (discord_user_id) DO UPDATE SET
+        payment_alt_name = EXCLUDED.payment_alt_name,
+        faction = EXCLUDED.faction;
+"""
+
+# In-process cache for the per-user DB lookup helpers only (get_alt_from_db, get_alts_bulk).
+# The bot itself reads alts from bot.alt_mappings, loaded once at startup; this cache is not that.
+# Filled on lookup, kept current by the save functions. Misses are cached as None.
+# Entries expire after ALT_CACHE_TTL_SECONDS (edits made outside the bot show up eventually) and
+# the least recently used are evicted beyond ALT_CACHE_MAX_ENTRIES.
+ALT_CACHE_TTL_SECONDS = 300.0
+ALT_CACHE_MAX_ENTRIES = 4096
+_ALT_CACHE: "OrderedDict[str, Tuple[float, Optional[AltInfo]]]" = OrderedDict() # id -> (expires_at, alt)
+
+def _alt_cache_get(discord_user_id: str) -> Tuple[bool, Optional[AltInfo]]:
+    """Returns (hit, alt). A hit with alt None is a cached 'no alt registered'."""
+    entry = _ALT_CACHE.get(discord_user_id)
+    if entry is None:
+        return False, None
+    if entry[0] < time.monotonic():
+        del _ALT_CACHE[discord_user_id]
+        return False, None
+    _ALT_CACHE.move_to_end(discord_user_id)
+    return True, entry[1]
+
+def _alt_cache_put(discord_user_id: str, alt_info: Optional[AltInfo]) -> None:
+    _ALT_CACHE[discord_user_id] = (time.monotonic() + ALT_CACHE_TTL_SECONDS, alt_info)
+    _ALT_CACHE.move_to_end(discord_user_id)
+    while len(_ALT_CACHE) > ALT_CACHE_MAX_ENTRIES:
+        _ALT_CACHE.popitem(last=False)
+
+def invalidate_alt_cache() -> None:
+    """Drops every cached alt (e.g. after the alts table was edited outside the bot)."""
+    _ALT_CACHE.clear()
+
 async def load_all_alt_mappings_from_db(pool: asyncpg.Pool) -> Dict[str, AltInfo]:
-    records = await db_fetch(pool, "SELECT discord_user_id, payment_alt_name, faction FROM alts")
-    loaded_mappings: Dict[str, AltInfo] = {}
-    for record in records:
-        loaded_mappings[str(record['discord_user_id'])] = { # Ensure user_id is string
-            "alt": record['payment_alt_name'],
-            "faction": record['faction']
-        }
+    records = await db_fetch(pool, SELECT_ALL_ALTS_SQL)
+    # discord_user_id is a TEXT column, so keys already arrive as str
+    loaded_mappings: Dict[str, AltInfo] = {
+        record['discord_user_id']: {"alt": record['payment_alt_name'], "faction": record['faction']}
+        for record in records
+    }
     return loaded_mappings
 
 async def get_alt_from_db(pool: asyncpg.Pool, discord_user_id: str) -> Optional[AltInfo]:
-    record = await db_fetchrow(pool, 
-        "SELECT payment_alt_name, faction FROM alts WHERE discord_user_id = $1", 
-        discord_user_id)
+    hit, alt_info = _alt_cache_get(discord_user_id)
+    if hit:
+        return alt_info
+    record = await db_fetchrow(pool, SELECT_ALT_SQL, discord_user_id)
     if record:
-        return {"alt": record['payment_alt_name'], "faction": record['faction']}
-    return None
+        alt_info = {"alt": record['payment_alt_name'], "faction": record['faction']}
+    _alt_cache_put(discord_user_id, alt_info)
+    return alt_info
+
+async def get_alts_bulk(pool: asyncpg.Pool, discord_user_ids: List[str]) -> Dict[str, AltInfo]:
+    """Looks up many alts at once: cached IDs are answered locally, the rest in one ANY($1) query.
+
+    IDs without a registered alt are left out of the result.
+    """
+    found: Dict[str, AltInfo] = {}
+    missing_ids: List[str] = []
+    for user_id in dict.fromkeys(discord_user_ids): # De-duplicated, order kept
+        hit, alt_info = _alt_cache_get(user_id)
+        if not hit:
+            missing_ids.append(user_id)
+        elif alt_info is not None:
+            found[user_id] = alt_info
+    if missing_ids:
+        records = await db_fetch(pool, SELECT_ALTS_BY_IDS_SQL, missing_ids)
+        fetched: Dict[str, AltInfo] = {
+            record['discord_user_id']: {"alt": record['payment_alt_name'], "faction": record['faction']}
+            for record in records
+        }
+        for user_id in missing_ids:
+            alt_info = fetched.get(user_id)
+            _alt_cache_put(user_id, alt_info) # Misses are remembered too
+            if alt_info is not None:
+                found[user_id] = alt_info
+    return found
 
 async def save_alt_to_db(pool: asyncpg.Pool, discord_user_id: str, alt_name: str, faction: str) -> None:
-    query = """
-        INSERT INTO alts (discord_user_id, payment_alt_name, faction)
-        VALUES ($1, $2, $3)
-        ON CONFLICT (discord_user_id) DO UPDATE SET
-            payment_alt_name = EXCLUDED.payment_alt_name,
-            faction = EXCLUDED.faction;
+    await db_execute(pool, UPSERT_ALT_SQL, discord_user_id, alt_name, faction)
+    _alt_cache_put(discord_user_id, {"alt": alt_name, "faction": faction}) # Only after the upsert succeeded
+
+async def save_alts_bulk_to_db(pool: asyncpg.Pool, mappings: Dict[str, AltInfo]) -> None:
+    """Upserts many alts in one statement (e.g. imports), passing them as a single JSONB array."""
+    if not mappings:
+        return
+    async with pool.acquire() as connection:
+        await save_alts_bulk_to_db_conn(connection, mappings)
+
+async def save_alts_bulk_to_db_conn(connection: asyncpg.Connection, mappings: Dict[str, AltInfo]) -> None:
+    """save_alts_bulk_to_db on an already-acquired connection (see db_session)."""
+    if not mappings:
+        return
+    payload = [
+        {"discord_user_id": user_id, "payment_alt_name": info["alt"], "faction": info["faction"]}
+        for user_id, info in mappings.items()
+    ]
+    await db_execute_conn(connection, UPSERT_ALTS_BULK_SQL, payload) # JSONB-encoded by init_db_connection's codec
+    for user_id, info in mappings.items():
+        _alt_cache_put(user_id, {"alt": info["alt"], "faction": info["faction"]})
+
+_RUN_LOGS_SELECT_FROM = """
+    SELECT log_id, run_date, wcl_link, total_gold, raid_leader_cut_percentage, 
+           raid_leader_share_gold, guild_cut_percentage, guild_share_gold, 
+           gold_per_booster, num_boosters, active_boosters, benched_players, 
+           processed_by_user_id, processed_by_username, timestamp_utc 
+    FROM run_logs"""
+
+# Rows without a timestamp sort last; log_id makes the order total (see run_logs_ts_id_idx)
+_RUN_LOGS_ORDER_BY = " ORDER BY timestamp_utc DESC NULLS LAST, log_id DESC"
+
+SELECT_RUN_LOGS_SQL = _RUN_LOGS_SELECT_FROM + _RUN_LOGS_ORDER_BY
+
+async def iter_run_logs_from_db(pool: asyncpg.Pool, prefetch: int = 500) -> AsyncIterator[asyncpg.Record]:
+    """Streams run logs newest-first through a server-side cursor, `prefetch` rows per round-trip.
+
+    Memory stays bounded by `prefetch` regardless of table size. Holds one pooled
+    connection (and its read transaction) until iteration finishes. Rows are read-only
+    asyncpg Records (r['col'] / r.get('col')); copy with dict(r) before mutating.
     """
-    await db_execute(pool, query, discord_user_id, alt_name, faction)
-
-async def load_all_run_logs_from_db(pool: asyncpg.Pool) -> List[Dict]:
-    records = await db_fetch(pool, """
-        SELECT log_id, run_date, wcl_link, total_gold, raid_leader_cut_percentage, 
-               raid_leader_share_gold, guild_cut_percentage, guild_share_gold, 
-               gold_per_booster, num_boosters, active_boosters, benched_players, 
-               processed_by_user_id, processed_by_username, timestamp_utc 
-        FROM run_logs ORDER BY timestamp_utc DESC
-    """)
-    # Convert asyncpg.Record to dict; asyncpg handles JSONB to Python dict/list automatically
-    return [dict(record) for record in records]
+    async with pool.acquire() as connection:
+        async with connection.transaction(): # Cursors only live inside a transaction
+            async for record in connection.cursor(SELECT_RUN_LOGS_SQL, prefetch=prefetch):
+                # JSONB columns are decoded to lists/dicts by init_db_connection's codec
+                yield record
 
-async def save_run_log_entry_to_db(pool: asyncpg.Pool, log_entry: Dict) -> None:
-    """Saves a single run log entry to the database."""
-    query = """
-        INSERT INTO run_logs (
-            run_date, wcl_link, total_gold, raid_leader_cut_percentage,
-            raid_leader_share_gold, guild_cut_percentage, guild_share_gold,
-            gold_per_booster, num_boosters, active_boosters, benched_players,
-            processed_by_user_id, processed_by_username, timestamp_utc
-        ) VALUES (
-            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14
-        );
+async def load_all_run_logs_from_db(pool: asyncpg.Pool) -> List[asyncpg.Record]:
+    # Materializes every row anyway, so one plain fetch beats cursor round-trips (use iter_* to stream)
+    return await db_fetch(pool, SELECT_RUN_LOGS_SQL)
+
+# Keyset pagination on (timestamp_utc, log_id). Each position in the order gets its own constant,
+# OR-free query so every page is a range scan of run_logs_ts_id_idx starting at the previous page's end.
+_RUN_LOGS_PAGE_LIMIT = " LIMIT $1"
+
+SELECT_RUN_LOGS_FIRST_PAGE_SQL = _RUN_LOGS_SELECT_FROM + _RUN_LOGS_ORDER_BY + _RUN_LOGS_PAGE_LIMIT
+
+# After a timestamped row: older rows, ties broken by lower log_id (NULL timestamps never compare true)
+SELECT_RUN_LOGS_AFTER_TS_PAGE_SQL = (_RUN_LOGS_SELECT_FROM + " WHERE (timestamp_utc, log_id) < ($2, $3)"
+                                     + _RUN_LOGS_ORDER_BY + _RUN_LOGS_PAGE_LIMIT)
+
+# The NULL-timestamp tail, which sorts after every timestamped row: from its start, then after a given log_id
+SELECT_RUN_LOGS_NULL_TS_PAGE_SQL = (_RUN_LOGS_SELECT_FROM + " WHERE timestamp_utc IS NULL"
+                                    + _RUN_LOGS_ORDER_BY + _RUN_LOGS_PAGE_LIMIT)
+
+SELECT_RUN_LOGS_NULL_TS_AFTER_ID_PAGE_SQL = (_RUN_LOGS_SELECT_FROM + " WHERE timestamp_utc IS NULL AND log_id < $2"
+                                             + _RUN_LOGS_ORDER_BY + _RUN_LOGS_PAGE_LIMIT)
+
+async def load_run_logs_page_from_db(pool: asyncpg.Pool, limit: int = 100,
+                                     before_ts: Optional[datetime.datetime] = None,
+                                     before_log_id: Optional[int] = None) -> List[asyncpg.Record]:
+    """Fetches up to `limit` run logs newest-first, continuing after a previous page if given.
+
+    For the next page pass the last row's timestamp_utc and log_id as `before_ts` and
+    `before_log_id` (before_ts may be None). Leave `before_log_id` unset for the first page.
+    """
+    if before_log_id is None:
+        return await db_fetch(pool, SELECT_RUN_LOGS_FIRST_PAGE_SQL, limit)
+    if before_ts is None: # Already inside the NULL-timestamp tail
+        return await db_fetch(pool, SELECT_RUN_LOGS_NULL_TS_AFTER_ID_PAGE_SQL, limit, before_log_id)
+    async with db_session(pool) as connection:
+        records = await db_fetch_conn(connection, SELECT_RUN_LOGS_AFTER_TS_PAGE_SQL, limit, before_ts, before_log_id)
+        if len(records) < limit: # Timestamped rows ran out; fill the page from the start of the NULL tail
+            records += await db_fetch_conn(connection, SELECT_RUN_LOGS_NULL_TS_PAGE_SQL, limit - len(records))
+        return records
+
+RUN_LOG_COLUMNS = (
+    "run_date", "wcl_link", "total_gold", "raid_leader_cut_percentage",
+    "raid_leader_share_gold", "guild_cut_percentage", "guild_share_gold",
+    "gold_per_booster", "num_boosters", "active_boosters", "benched_players",
+    "processed_by_user_id", "processed_by_username", "timestamp_utc",
+)
+
+def coerce_log_entry_dates(log_entry: Dict) -> Dict:
+    """Returns a copy of a run log entry with run_date as a date and timestamp_utc as a datetime.
+
+    Call this once where an entry is built (or read from an external source); the save
+    functions expect already-typed values. Unparseable values become None (stored as NULL).
     """
+    coerced = dict(log_entry)
     # Convert date string to datetime.date object if it's not already
     run_date_obj = log_entry.get("run_date")
     if isinstance(run_date_obj, str):
         try:
-            run_date_obj = datetime.datetime.strptime(run_date_obj, '%Y-%m-%d').date()
+            run_date_obj = _parse_ymd(run_date_obj)
         except ValueError:
             print(f"Warning: Could not parse run_date string '{log_entry.get('run_date')}' for DB insert. Using NULL.")
             run_date_obj = None
+    coerced["run_date"] = run_date_obj
     
     # Convert timestamp_utc string to datetime object if it's not already
     timestamp_utc_obj = log_entry.get("timestamp_utc")
-    if isinstance(timestamp_utc_obj, str): # Should already be a datetime object from /cut
+    if isinstance(timestamp_utc_obj, str):
         try:
             timestamp_utc_obj = datetime.datetime.fromisoformat(timestamp_utc_obj)
         except ValueError:
@@ -150,33 +388,130 @@ async def save_run_log_entry_to_db(pool: asyncpg.Pool, log_entry: Dict) -> None:
     elif not isinstance(timestamp_utc_obj, datetime.datetime): # If it's something else unexpected
         print(f"Warning: timestamp_utc is not a datetime object or recognized string. Type: {type(timestamp_utc_obj)}. Using NULL.")
         timestamp_utc_obj = None
+    coerced["timestamp_utc"] = timestamp_utc_obj
+    return coerced
 
+# Builds a RUN_LOG_COLUMNS-ordered tuple in one C call instead of 14 dict.get()s
+_RUN_LOG_GETTER = operator.itemgetter(*RUN_LOG_COLUMNS)
+# Fallback values for entries missing some keys; JSONB lists default to empty
+_RUN_LOG_DEFAULTS: Dict[str, Any] = {**dict.fromkeys(RUN_LOG_COLUMNS), "active_boosters": [], "benched_players": []}
 
-    # ---- MODIFICATION HERE ----
-    # Explicitly convert lists/dicts intended for JSONB columns to JSON strings
-    active_boosters_json = json.dumps(log_entry.get("active_boosters", []))
-    benched_players_json = json.dumps(log_entry.get("benched_players", []))
-    # ---- END MODIFICATION ----
-
-    await db_execute(pool, query,
-        run_date_obj,
-        log_entry.get("wcl_link"), 
-        log_entry.get("total_gold"),
-        log_entry.get("raid_leader_cut_percentage"), 
-        log_entry.get("raid_leader_share_gold"),
-        log_entry.get("guild_cut_percentage"), 
-        log_entry.get("guild_share_gold"),
-        log_entry.get("gold_per_booster"), 
-        log_entry.get("num_boosters"),
-        active_boosters_json,         # Pass the JSON string
-        benched_players_json,         # Pass the JSON string
-        log_entry.get("processed_by_user_id"), 
-        log_entry.get("processed_by_username"),
-        timestamp_utc_obj
-    )
+def _run_log_record(log_entry: Dict) -> Tuple:
+    """Converts a typed run log dict (see coerce_log_entry_dates) into a tuple ordered like RUN_LOG_COLUMNS."""
+    try:
+        return _RUN_LOG_GETTER(log_entry)
+    except KeyError: # Partial entry (e.g. old backfill data): fill the gaps first
+        return _RUN_LOG_GETTER({**_RUN_LOG_DEFAULTS, **log_entry})
+
+INSERT_RUN_LOG_SQL = """
+    INSERT INTO run_logs (
+        run_date, wcl_link, total_gold, raid_leader_cut_percentage,
+        raid_leader_share_gold, guild_cut_percentage, guild_share_gold,
+        gold_per_booster, num_boosters, active_boosters, benched_players,
+        processed_by_user_id, processed_by_username, timestamp_utc
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14
+    );
+"""
+
+async def save_run_log_entry_to_db(pool: asyncpg.Pool, log_entry: Dict) -> None:
+    """Saves a single run log entry (dates already typed, see coerce_log_entry_dates) to the database."""
+    await db_execute(pool, INSERT_RUN_LOG_SQL, *_run_log_record(log_entry))
+
+async def save_run_log_entry_to_db_conn(connection: asyncpg.Connection, log_entry: Dict) -> None:
+    """save_run_log_entry_to_db on an already-acquired connection (see db_session)."""
+    await db_execute_conn(connection, INSERT_RUN_LOG_SQL, *_run_log_record(log_entry))
+
+# Below this many rows a pipelined executemany beats COPY's extra setup round-trips
+RUN_LOG_COPY_THRESHOLD = 64
+
+async def save_run_log_entries_bulk_to_db(pool: asyncpg.Pool, log_entries: List[Dict]) -> None:
+    """Saves many run log entries (e.g. backfills) in one batch instead of one INSERT round-trip per row.
+
+    Small batches go through executemany, larger ones through a binary COPY; both are atomic.
+    Entries must already be typed; run backfilled data through coerce_log_entry_dates first.
+    """
+    if not log_entries:
+        return
+    records = [_run_log_record(entry) for entry in log_entries]
+    async with pool.acquire() as connection:
+        if len(records) < RUN_LOG_COPY_THRESHOLD:
+            await connection.executemany(INSERT_RUN_LOG_SQL, records)
+        else:
+            await connection.copy_records_to_table('run_logs', records=records, columns=RUN_LOG_COLUMNS)
 
 # --- Other Utility Functions (No DB Interaction) ---
+def truncate_join(items: List[str], limit: int = 1020) -> str:
+    """Newline-joins items, truncating with '...' to fit a Discord embed field (1024 chars)."""
+    joined = "\n".join(items)
+    return joined if len(joined) <= limit else joined[:limit] + "..."
+
+
+# Player rows: captures Role, Name and ID (columns 1, 3, 4); Spec and anything after ID are skipped in C.
+# Only valid for exports without any '"' (no quoted fields); see parse_roster_data.
+_ROSTER_ROW_RE = re.compile(r'^([^,\r\n]*),[^,\r\n]*,([^,\r\n]*),([^,\r\n]*)', re.M)
+
+# raid-helper's event summary date (DD-MM-YYYY; day and month may be unpadded, as strptime allowed)
+_DMY_DATE_RE = re.compile(r'([0-9]{1,2})-([0-9]{1,2})-([0-9]{4})')
+
+# Roles (lowercased) that put a player on the bench list instead of the payout list
+_EXCLUDED_ROLES = frozenset(("absence", "tentative", "bench"))
+
+# Start of raid-helper's player-list header row ("Role,Spec,Name,ID,Timestamp,Status").
+# Searched case-insensitively on the original text: offsets into roster_string.lower() are not safe,
+# since lowercasing can change the length (e.g. 'İ' becomes two code points).
+_PLAYER_HEADER_RE = re.compile(r'^role,spec,', re.I | re.M)
+
+def _summary_date_to_iso(date_str: str) -> str:
+    """Converts the event summary's DD-MM-YYYY date to YYYY-MM-DD. Raises ValueError if invalid."""
+    date_match = _DMY_DATE_RE.fullmatch(date_str)
+    if not date_match:
+        raise ValueError(f"'{date_str}' is not in DD-MM-YYYY format")
+    day, month, year = date_match.groups()
+    return datetime.date(int(year), int(month), int(day)).isoformat() # Range-checks day/month
+
+def _add_roster_player(role: str, player_name: str, discord_id: str,
+                       active_boosters_with_ids: List[Tuple[str, str]], benched_players_names: List[str]) -> None:
+    """Sorts one already-stripped player row into the active or benched list."""
+    if not player_name or not discord_id:
+        return
+    if role.lower() in _EXCLUDED_ROLES:
+        benched_players_names.append(player_name)
+    # isascii() is an O(1) flag check and rules out Unicode digits (e.g. '²') that str.isdigit accepts
+    elif discord_id.isascii() and discord_id.isdigit():
+        active_boosters_with_ids.append((player_name, discord_id))
+
+def _parse_roster_data_csv(roster_string: str) -> Tuple[Optional[str], List[Tuple[str, str]], List[str]]:
+    """parse_roster_data for exports with quoted fields: csv.reader handles embedded commas and quotes."""
+    run_date: Optional[str] = None
+    active_boosters_with_ids: List[Tuple[str, str]] = []
+    benched_players_names: List[str] = []
+
+    reader = csv.reader(io.StringIO(roster_string))
+    parsing_players = False
+    for row in reader:
+        if not row:
+            continue
+
+        # --- LOGIC TO FIND AND PARSE THE EVENT SUMMARY ---
+        if not parsing_players and len(row) > 1 and row[0].strip().lower() == 'name' and row[1].strip().lower() == 'date':
+            try:
+                # The next row should contain the actual data; date is in the second column
+                run_date = _summary_date_to_iso(next(reader)[1].strip())
+            except (StopIteration, IndexError, ValueError) as e:
+                print(f"Could not parse run date from event summary: {e}")
+            continue
+
+        # --- LOGIC TO FIND AND PARSE THE PLAYER LIST ---
+        if len(row) > 1 and row[0].strip().lower() == 'role' and row[1].strip().lower() == 'spec':
+            parsing_players = True
+            continue
+
+        if parsing_players and len(row) >= 4:
+            _add_roster_player(row[0].strip(), row[2].strip(), row[3].strip(),
+                               active_boosters_with_ids, benched_players_names)
 
+    return run_date, active_boosters_with_ids, benched_players_names
 
 def parse_roster_data(roster_string: str) -> Tuple[Optional[str], List[Tuple[str, str]], List[str]]:
     """
@@ -190,74 +525,101 @@ def parse_roster_data(roster_string: str) -> Tuple[Optional[str], List[Tuple[str
         A tuple containing: (run_date_str, active_boosters, benched_players).
         The run_date_str will be None if it cannot be found.
     """
+    # Quoted fields can hide commas (and newlines) inside a value; only csv.reader gets those right.
+    # raid-helper only quotes when it has to, so most exports take the split/regex fast path below.
+    if '"' in roster_string:
+        return _parse_roster_data_csv(roster_string)
+
     run_date: Optional[str] = None
     active_boosters_with_ids: List[Tuple[str, str]] = []
     benched_players_names: List[str] = []
 
-    EXCLUDED_ROLES = {"absence", "tentative", "bench"}
-
-    reader = csv.reader(StringIO(roster_string))
-    
-    # A state flag to know when we are in the player list section
-    parsing_players = False
-
-    for row in reader:
-        # Skip empty rows
-        if not row:
+    player_text: Optional[str] = None
+    header_match = _PLAYER_HEADER_RE.search(roster_string)
+    if header_match:
+        header_pos = header_match.start()
+        # Fast path: only the short event summary above the header is scanned line by line
+        lines = roster_string[:header_pos].splitlines()
+        header_end = roster_string.find("\n", header_pos)
+        player_text = roster_string[header_end + 1:] if header_end >= 0 else ""
+    else:
+        # Unusual header (padded): fall back to scanning every line for it
+        lines = roster_string.splitlines()
+
+    # Header scan state: the summary comes first, so once it's read only the player header is left to find
+    seeking_summary = True
+    for i, line in enumerate(lines):
+        row = line.split(',', 2)
+        if len(row) < 2:
             continue
+        first_col = row[0].strip().lower()
 
         # --- LOGIC TO FIND AND PARSE THE EVENT SUMMARY ---
-        # Check if this row looks like the event summary header
-        if not parsing_players and len(row) > 1 and row[0].strip().lower() == 'name' and row[1].strip().lower() == 'date':
+        if seeking_summary and first_col == 'name' and row[1].strip().lower() == 'date':
             try:
-                # The next row should contain the actual data
-                event_data_row = next(reader)
-                date_str = event_data_row[1].strip()  # Date is in the second column
-                # Convert from DD-MM-YYYY to the required YYYY-MM-DD format
-                dt_object = datetime.datetime.strptime(date_str, '%d-%m-%Y')
-                run_date = dt_object.strftime('%Y-%m-%d')
-            except (StopIteration, IndexError, ValueError) as e:
+                # The next row should contain the actual data; date is in the second column
+                run_date = _summary_date_to_iso(lines[i + 1].split(',')[1].strip())
+            except (IndexError, ValueError) as e:
                 # Handle cases where the file ends, the row is too short, or date format is wrong
                 print(f"Could not parse run date from event summary: {e}")
+            if player_text is not None:
+                break # Fast path already located the player list; nothing left to scan
+            seeking_summary = False
             continue
 
-        # --- LOGIC TO FIND AND PARSE THE PLAYER LIST ---
-        # Check if this row is the player list header
-        if len(row) > 1 and row[0].strip().lower() == 'role' and row[1].strip().lower() == 'spec':
-            parsing_players = True  # We've found the start of the player list
-            continue # Skip the header row and start parsing players from the next line
-
-        if parsing_players:
-            if len(row) < 4:
-                continue
-            
-            role = row[0].strip().lower()
-            player_name = row[2].strip()
-            discord_id = row[3].strip()
-
-            if not player_name or not discord_id:
-                continue
-
-            if role in EXCLUDED_ROLES:
-                benched_players_names.append(player_name)
-            else:
-                if discord_id.isdigit():
-                    active_boosters_with_ids.append((player_name, discord_id))
+        # --- LOGIC TO FIND THE PLAYER LIST ---
+        if first_col == 'role' and row[1].strip().lower() == 'spec':
+            player_text = "\n".join(lines[i + 1:])
+            break
+
+    if player_text is None:
+        return run_date, active_boosters_with_ids, benched_players_names
+
+    # --- PARSE THE PLAYER LIST (one regex pass over the remaining text) ---
+    # Loop-invariant lookups bound to locals once
+    excluded_roles = _EXCLUDED_ROLES
+    active_append = active_boosters_with_ids.append
+    bench_append = benched_players_names.append
+    for match in _ROSTER_ROW_RE.finditer(player_text):
+        raw_role, raw_name, raw_id = match.groups()
+        player_name = raw_name.strip()
+        discord_id = raw_id.strip()
+
+        if not player_name or not discord_id:
+            continue
+
+        if raw_role.strip().lower() in excluded_roles:
+            bench_append(player_name)
+        else:
+            # isascii() is an O(1) flag check and rules out Unicode digits (e.g. '²') that str.isdigit accepts
+            if discord_id.isascii() and discord_id.isdigit():
+                active_append((player_name, discord_id))
 
     return run_date, active_boosters_with_ids, benched_players_names
 
-async def send_long_message_or_file(interaction: discord.Interaction,
+# Messages longer than this are UTF-8 encoded in a worker thread so the event loop keeps serving
+UPLOAD_ENCODE_THREAD_THRESHOLD = 64 * 1024
+
+def _build_upload(message: str) -> io.BytesIO:
+    """Encodes a message into an in-memory file for discord.File."""
+    return io.BytesIO(message.encode('utf-8'))
+
+async def send_long_message_or_file(interaction: "discord.Interaction",
                                     primary_content: str,
                                     secondary_content: str,
                                     filename: str,
                                     ephemeral: bool = False):
-    full_message = primary_content
+    # Deferred so DB-only users of utils (scripts, workers) don't pay for importing discord
+    import discord
+
     if secondary_content:
+        # Pad to a blank line between the two sections
+        separator = ""
         if primary_content and not primary_content.endswith("\n\n"):
-            if not primary_content.endswith("\n"):
-                full_message += "\n"
-            full_message += "\n"
-        full_message += secondary_content
+            separator = "\n" if primary_content.endswith("\n") else "\n\n"
+        full_message = "".join((primary_content, separator, secondary_content))
+    else:
+        full_message = primary_content
 
     if interaction.response.is_done():
         send_method = interaction.followup.send
@@ -270,9 +632,10 @@ async def send_long_message_or_file(interaction: discord.Interaction,
         send_method = interaction.followup.send
 
     if len(full_message) > 1950:
-        output_file = io.StringIO()
-        output_file.write(full_message)
-        output_file.seek(0)
+        if len(full_message) > UPLOAD_ENCODE_THREAD_THRESHOLD:
+            output_file = await asyncio.to_thread(_build_upload, full_message)
+        else: # Small payloads: encoding is cheaper than a thread hop
+            output_file = _build_upload(full_message)
         intro_text = f"Output too long, attached as `{filename}`."
         if primary_content and len(primary_content) < 300 :
             intro_text = f"{primary_content}\n... (additional details in attached file `{filename}`)"